@@ -2,15 +2,24 @@
 # -*- coding: utf-8 -*-
 """Chinese Flashcard App - Practice your vocabulary!"""
 
+import atexit
 import csv
+import hashlib
+import heapq
 import random
+import re
 import os
+import shutil
 import sys
+import time
 import base64
 import io
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+from collections import deque
+from functools import lru_cache
+from itertools import count, groupby
+from operator import itemgetter
 
 # For cross-platform key detection
 try:
@@ -24,147 +33,308 @@ except ImportError:
 # Debug logging
 DEBUG_LOG = True
 DEBUG_LOG_PATH = Path(__file__).parent / 'debug.log'
+_debug_log_file = None  # opened on first use, kept open until exit
 
 def debug_log(msg):
     """Write debug message to log file."""
-    if DEBUG_LOG:
-        with open(DEBUG_LOG_PATH, 'a', encoding='utf-8') as f:
-            f.write(f"{datetime.now().isoformat()} - {msg}\n")
+    global _debug_log_file
+    if not DEBUG_LOG:
+        return
+    if _debug_log_file is None:
+        _debug_log_file = open(DEBUG_LOG_PATH, 'a', encoding='utf-8', buffering=1)
+        atexit.register(_debug_log_file.close)
+    _debug_log_file.write(f"{datetime.now().isoformat()} - {msg}\n")
 
-# Check for image support
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
+# Image support: PIL is only imported the first time an image is needed,
+# since it is slow to load and unused outside iTerm2/Kitty
+HAS_PIL = None  # None until has_pil() has checked
+
+
+def has_pil():
+    """Import PIL on first use and report whether image rendering is available."""
+    global HAS_PIL, Image, ImageDraw, ImageFont
+    if HAS_PIL is None:
+        try:
+            from PIL import Image, ImageDraw, ImageFont
+            HAS_PIL = True
+        except ImportError:
+            HAS_PIL = False
+    return HAS_PIL
+
+# Plotting: matplotlib is imported the first time plots are generated,
+# with the non-interactive Agg backend selected before pyplot loads
+HAS_MPL = None  # None until has_matplotlib() has checked
 
 
-def flush_stdin():
-    """Flush any pending input from stdin."""
-    debug_log("flush_stdin() called")
-    if UNIX:
-        import select
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
+def has_matplotlib():
+    """Import matplotlib on first use and report whether plotting is available."""
+    global HAS_MPL, plt, np
+    if HAS_MPL is None:
         try:
-            tty.setraw(sys.stdin.fileno())
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+            import numpy as np  # always installed alongside matplotlib
+            HAS_MPL = True
+        except ImportError:
+            HAS_MPL = False
+    return HAS_MPL
+
+# Rendered character images, reused across runs
+IMAGE_CACHE_DIR = Path(__file__).parent / '.imgcache'
+# Bump whenever create_character_image() draws differently, so stale PNGs are not reused
+IMAGE_RENDER_VERSION = 1
+
+
+# Terminal settings saved while stdin is held in raw mode (None when cooked)
+_saved_tty_settings = None
+
+
+def enter_raw_mode():
+    """Put the terminal in raw mode, once, until restore_terminal() is called."""
+    global _saved_tty_settings
+    if not UNIX or _saved_tty_settings is not None:
+        return
+    fd = sys.stdin.fileno()
+    _saved_tty_settings = termios.tcgetattr(fd)
+    tty.setraw(fd)
+    # Keep output post-processing on so '\n' still returns to column 0
+    # while cards are drawn in raw mode
+    mode = termios.tcgetattr(fd)
+    mode[1] |= termios.OPOST
+    termios.tcsetattr(fd, termios.TCSADRAIN, mode)
+
+
+def restore_terminal():
+    """Restore the terminal settings saved by enter_raw_mode()."""
+    global _saved_tty_settings
+    if _saved_tty_settings is None:
+        return
+    termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, _saved_tty_settings)
+    _saved_tty_settings = None
+
+
+def prompt(text=''):
+    """Read a line of input, leaving raw mode first so typing echoes normally."""
+    restore_terminal()
+    return input(text)
+
+
+# Event returned by KeyReader.next_event() when the user types "quit"
+QUIT = 'quit'
+
+# Keys the app responds to; everything else is ignored
+ALLOWED_KEYS = ' qQxX0123456789pdwmsPDWMSuUiItTbBhH'
+
+# Command keys in either case, checked by set membership instead of key.lower()
+QUIT_START_KEYS = frozenset('qQ')
+PAUSE_KEYS = frozenset('pP')
+BACK_KEYS = frozenset('bB')
+WRONG_KEYS = frozenset('xX')
+
+
+class KeyReader:
+    """Turn raw keypresses into events for the card loops.
+
+    Bytes are read straight from the stdin file descriptor (raw mode stays
+    on between reads), escape sequences and control bytes from mouse events
+    are dropped, and typing "quit" within QUIT_TIMEOUT seconds is reported
+    as a single QUIT event.
+    """
+
+    QUIT_TIMEOUT = 1.0  # seconds to finish typing "quit" after the 'q'
+
+    def __init__(self):
+        self.pending = deque()  # keys read ahead while matching "quit"
+
+    def _wait(self, timeout):
+        """Return True if input arrives within timeout seconds."""
+        if UNIX:
+            import select
+            return bool(select.select([sys.stdin], [], [], timeout)[0])
+        deadline = time.monotonic() + timeout
+        while not msvcrt.kbhit():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _read_bytes(self, max_bytes):
+        """Read up to max_bytes of whatever the terminal has sent, in one read()."""
+        enter_raw_mode()
+        data = os.read(sys.stdin.fileno(), max_bytes)
+        if not data:
+            raise EOFError("stdin closed")
+        return data
+
+    def _read_char(self):
+        """Read one byte from the terminal as a character."""
+        return self._read_bytes(1).decode('latin-1')
+
+    def _drain(self, timeout):
+        """Discard input until none arrives for timeout seconds; return what was dropped."""
+        # select() on a cooked terminal reports a pending line as readable, but
+        # switching to raw mode in _read_bytes() would then discard it and block
+        enter_raw_mode()
+        drained = []
+        while self._wait(timeout):
+            drained.append(self._read_bytes(4096))
+        return b''.join(drained)
+
+    def flush(self):
+        """Discard any pending input (e.g., from mouse events)."""
+        debug_log("KeyReader.flush() called")
+        self.pending.clear()
+        if UNIX:
             # Keep reading until nothing is pending
-            flushed = []
-            while select.select([sys.stdin], [], [], 0.1)[0]:
-                ch = sys.stdin.read(1)
-                flushed.append(f"ord={ord(ch)} repr={repr(ch)}")
+            flushed = self._drain(0.1)
             if flushed:
-                debug_log(f"flush_stdin() flushed: {flushed}")
+                if DEBUG_LOG:
+                    debug_log(f"KeyReader.flush() flushed: {flushed}")
             else:
-                debug_log("flush_stdin() nothing to flush")
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-
+                debug_log("KeyReader.flush() nothing to flush")
 
-def get_key():
-    """Get a single keypress, filtering out escape sequences from mouse events."""
-    if UNIX:
-        import select
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            ch = sys.stdin.read(1)
-            debug_log(f"get_key() read: ord={ord(ch)} repr={repr(ch)}")
+    def read_key(self):
+        """Get a single keypress, filtering out escape sequences from mouse events."""
+        if UNIX:
+            ch = self._read_char()
+            if DEBUG_LOG:
+                debug_log(f"read_key() read: ord={ord(ch)} repr={repr(ch)}")
 
             # If it's an escape character, consume the rest of the escape sequence
             if ch == '\x1b':
-                consumed = []
                 # Consume all pending input from the escape sequence
                 # Use longer timeout and multiple passes to ensure we get everything
-                for _ in range(3):  # Multiple passes to catch delayed characters
-                    while select.select([sys.stdin], [], [], 0.15)[0]:
-                        esc_ch = sys.stdin.read(1)
-                        consumed.append(f"ord={ord(esc_ch)} repr={repr(esc_ch)}")
-                debug_log(f"get_key() escape sequence consumed: {consumed}")
+                consumed = b''.join(self._drain(0.15) for _ in range(3))  # catch delayed characters
+                if DEBUG_LOG:
+                    debug_log(f"read_key() escape sequence consumed: {consumed}")
                 return None  # Return None for escape sequences
 
             # Filter out all control characters (ord < 32) except we handle space separately
             # This catches any stray bytes from mouse events
             if ord(ch) < 32 and ch != ' ':
-                consumed = []
                 # Consume any following characters that might be part of a sequence
-                while select.select([sys.stdin], [], [], 0.05)[0]:
-                    ctrl_ch = sys.stdin.read(1)
-                    consumed.append(f"ord={ord(ctrl_ch)} repr={repr(ctrl_ch)}")
-                debug_log(f"get_key() control char filtered, consumed: {consumed}")
+                consumed = self._drain(0.05)
+                if DEBUG_LOG:
+                    debug_log(f"read_key() control char filtered, consumed: {consumed}")
                 return None
 
             # Return allowed characters
-            if ch == ' ' or ch in 'qQxX0123456789pdwmsPDWMSuUiItTbBhH':
-                debug_log(f"get_key() returning: {repr(ch)}")
+            if ch in ALLOWED_KEYS:
+                if DEBUG_LOG:
+                    debug_log(f"read_key() returning: {repr(ch)}")
                 return ch
 
             # Ignore other characters (could be high bytes from mouse events)
-            debug_log(f"get_key() ignoring: ord={ord(ch)} repr={repr(ch)}")
+            if DEBUG_LOG:
+                debug_log(f"read_key() ignoring: ord={ord(ch)} repr={repr(ch)}")
+            return None
+        else:
+            ch = msvcrt.getch().decode('utf-8', errors='ignore')
+            if DEBUG_LOG:
+                debug_log(f"read_key() Windows read: {repr(ch)}")
+            if ch and ch in ALLOWED_KEYS:
+                return ch
             return None
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    else:
-        ch = msvcrt.getch().decode('utf-8', errors='ignore')
-        debug_log(f"get_key() Windows read: {repr(ch)}")
-        if ch == ' ' or ch in 'qQxX0123456789pdwmsPDWMSuUiItTbBhH':
-            return ch
-        return None
-
-
-def check_for_quit(key):
-    """Check if user is typing 'quit'. Returns True if quit detected, False otherwise."""
-    if key is None:
-        return False
-    if key.lower() != 'q':
-        return False
-
-    # User typed 'q', now check for 'uit'
-    debug_log("check_for_quit() - got 'q', checking for 'uit'")
-    buffer = 'q'
 
-    # Wait briefly for the remaining characters with timeout
-    import time
-    timeout = time.time() + 1.0  # 1 second to type "quit"
+    def next_event(self):
+        """Return the next key, QUIT if "quit" was typed, or None for ignored input."""
+        key = self.pending.popleft() if self.pending else self.read_key()
+        if key not in QUIT_START_KEYS:
+            return key
+
+        # Got 'q', now wait (briefly) for the rest of "quit"
+        debug_log("next_event() - got 'q', checking for 'uit'")
+        typed = 'q'
+        deadline = time.monotonic() + self.QUIT_TIMEOUT
+        while typed != 'quit':
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._wait(remaining):
+                if DEBUG_LOG:
+                    debug_log(f"next_event() - timeout, typed: {typed}")
+                return None
+            key = self.read_key()
+            if key is None:
+                continue
+            if not 'quit'.startswith(typed + key.lower()):
+                # Not "quit": drop the partial word but keep the key that broke it
+                if DEBUG_LOG:
+                    debug_log(f"next_event() - not quit, typed: {typed + key}")
+                self.pending.append(key)
+                return None
+            typed += key.lower()
 
-    while len(buffer) < 4 and time.time() < timeout:
-        key = get_key()
-        if key is None:
-            continue
-        buffer += key.lower()
-        debug_log(f"check_for_quit() - buffer now: {buffer}")
+        debug_log("next_event() - QUIT confirmed")
+        return QUIT
 
-        if buffer == 'quit':
-            debug_log("check_for_quit() - QUIT confirmed")
-            return True
-        elif not 'quit'.startswith(buffer):
-            # User typed something that's not part of 'quit'
-            debug_log(f"check_for_quit() - not quit, buffer: {buffer}")
-            return False
 
-    # Timeout or wrong sequence
-    debug_log(f"check_for_quit() - timeout or incomplete, buffer: {buffer}")
-    return False
+# Lines last drawn by draw_screen(), or None if the screen content is unknown
+_screen_frame = None
+# Terminal size when _screen_frame was drawn
+_screen_size = None
 
 
 def clear_screen():
     """Clear the terminal screen."""
+    global _screen_frame
+    _screen_frame = None
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
+def write_lines(lines):
+    """Write a block of lines to the terminal in a single call."""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
+
+
+def draw_screen(lines):
+    """Show a full-screen view, rewriting only the lines that changed since the last one."""
+    global _screen_frame, _screen_size
+    previous = _screen_frame
+    size = shutil.get_terminal_size()
+    # Cursor addressing only works if every line fits on one terminal row and
+    # the whole frame fits without scrolling; a resize reflows the old frame
+    if (previous is None or size != _screen_size or len(lines) >= size.lines
+            or any(visible_width(ANSI_RE.sub('', line)) >= size.columns for line in lines)):
+        clear_screen()
+        write_lines(lines)
+    else:
+        out = []
+        for row, line in enumerate(lines, 1):
+            if row > len(previous) or previous[row - 1] != line:
+                out.append(f"\033[{row};1H{line}\033[K")
+        if len(lines) < len(previous):
+            out.append(f"\033[{len(lines) + 1};1H\033[J")
+        # Leave the cursor where a full redraw would have left it
+        out.append(f"\033[{len(lines) + 1};1H")
+        sys.stdout.write(''.join(out))
+        sys.stdout.flush()
+    _screen_frame = lines
+    _screen_size = size
+
+
 def load_words(csv_path):
     """Load words from CSV file."""
     words = []
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            # Empty file: no header, no words (as with csv.DictReader)
+            return words
+        # Look up column positions once instead of building a dict per row
+        pi, mi, ti, gi, ci = (header.index(name)
+                              for name in ('pinyin', 'meaning', 'tone', 'group', 'character'))
         for row in reader:
+            if not row:
+                continue
             words.append({
-                'pinyin': row['pinyin'],
-                'meaning': row['meaning'],
-                'tone': row['tone'],
-                'group': int(row['group']),
-                'character': row['character']
+                'pinyin': row[pi],
+                'meaning': row[mi],
+                'tone': row[ti],
+                'group': int(row[gi]),
+                'character': row[ci]
             })
     return words
 
@@ -174,26 +344,65 @@ def get_groups(words):
     return sorted(set(w['group'] for w in words))
 
 
+# Parsed results.csv kept between menu visits so only appended rows are parsed:
+# {path: {'file_id', 'offset', 'columns', 'results'}}
+_results_cache = {}
+
+
 def load_results(results_path):
-    """Load results from CSV file."""
-    results = []
-    if not results_path.exists():
-        return results
-    with open(results_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+    """Load results from CSV file, parsing only rows added since the last load."""
+    try:
+        st = results_path.stat()
+    except OSError:
+        return []
+
+    # results.csv is append-only; anything else (new file, truncation)
+    # invalidates the cache and triggers a full parse
+    file_id = (st.st_dev, st.st_ino)
+    cached = _results_cache.get(str(results_path))
+    if cached is None or cached['file_id'] != file_id or st.st_size < cached['offset']:
+        cached = {'file_id': file_id, 'offset': 0, 'columns': None, 'results': []}
+        _results_cache[str(results_path)] = cached
+
+    if st.st_size > cached['offset']:
+        with open(results_path, 'rb') as f:
+            f.seek(cached['offset'])
+            data = f.read()
+        # Only consume complete lines; a partial last row is picked up next time
+        end = data.rfind(b'\n') + 1
+        cached['offset'] += end
+        reader = csv.reader(io.StringIO(data[:end].decode('utf-8'), newline=''))
+
+        if cached['columns'] is None:
+            header = next(reader, None)
+            if header is None:
+                # Header line not fully written yet; resolve columns next time
+                return list(cached['results'])
+            # Look up column positions once instead of building a dict per row
+            try:
+                cached['columns'] = tuple(header.index(name) for name in RESULTS_HEADER)
+            except ValueError:
+                cached['columns'] = ()
+        if not cached['columns']:
+            return []
+
+        ti, si, pi, ci, gi, ki = cached['columns']
+        results = cached['results']
+        fromisoformat = datetime.fromisoformat
         for row in reader:
             try:
                 results.append({
-                    'timestamp': datetime.fromisoformat(row['timestamp']),
-                    'session_id': row['session_id'],
-                    'pinyin': row['pinyin'],
-                    'character': row['character'],
-                    'group': int(row['group']),
-                    'correct': row['correct'] == 'yes'
+                    'timestamp': fromisoformat(row[ti]),
+                    'session_id': row[si],
+                    'pinyin': row[pi],
+                    'character': row[ci],
+                    'group': int(row[gi]),
+                    'correct': row[ki] == 'yes'
                 })
-            except (ValueError, KeyError):
+            except (ValueError, IndexError):
                 continue
-    return results
+
+    return list(cached['results'])
 
 
 def get_mistake_words(words, results, time_period):
@@ -209,25 +418,41 @@ def get_mistake_words(words, results, time_period):
     else:
         cutoff = datetime.min
 
-    # Find characters with mistakes in the period
-    mistake_chars = set()
-    for r in results:
-        if r['timestamp'] >= cutoff and not r['correct']:
-            mistake_chars.add(r['character'])
+    # Find characters with mistakes in the period. Checking correctness first
+    # skips the timestamp comparison for the (much more common) correct rows.
+    mistake_chars = {r['character'] for r in results
+                     if not r['correct'] and r['timestamp'] >= cutoff}
+    mistake_chars.discard('_practice_')  # practice markers are never mistakes
 
     # Filter words
     return [w for w in words if w['character'] in mistake_chars]
 
 
-def save_result(results_path, word, correct, session_id, selected_groups):
-    """Save a test result to CSV."""
-    file_exists = results_path.exists()
+RESULTS_HEADER = ['timestamp', 'session_id', 'pinyin', 'character', 'group', 'correct']
+
 
-    with open(results_path, 'a', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['timestamp', 'session_id', 'pinyin', 'character', 'group', 'correct'])
-        writer.writerow([
+class ResultsWriter:
+    """Append rows to the results CSV, keeping the file open for a whole session."""
+
+    def __init__(self, results_path):
+        self.results_path = results_path
+        self.f = None
+        self.writer = None
+
+    def write_row(self, row):
+        """Write one raw CSV row, opening the file (and adding the header) on first use."""
+        if self.f is None:
+            self.f = open(self.results_path, 'a', encoding='utf-8', newline='')
+            self.writer = csv.writer(self.f)
+            if self.f.tell() == 0:
+                self.writer.writerow(RESULTS_HEADER)
+        self.writer.writerow(row)
+        # Hand each row to the OS right away so a closed terminal loses nothing
+        self.f.flush()
+
+    def record(self, word, correct, session_id):
+        """Save a test result."""
+        self.write_row([
             datetime.now().isoformat(),
             session_id,
             word['pinyin'],
@@ -236,14 +461,25 @@ def save_result(results_path, word, correct, session_id, selected_groups):
             'yes' if correct else 'no'
         ])
 
+    def close(self):
+        """Close the results file."""
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 def save_practice_time(results_path, session_id, duration_seconds, selected_groups):
     """Save practice session time (without recording individual results)."""
     # Encode selected groups in the group field
     # For single group or all groups (0): store directly
     # For multiple groups: store as comma-separated in pinyin field
-    file_exists = results_path.exists()
-
     if not selected_groups or 0 in selected_groups:
         # All groups
         group_code = 0
@@ -261,12 +497,9 @@ def save_practice_time(results_path, session_id, duration_seconds, selected_grou
         pinyin_start = f'_practice_start_{groups_str}_'
         pinyin_end = f'_practice_end_{groups_str}_'
 
-    with open(results_path, 'a', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(['timestamp', 'session_id', 'pinyin', 'character', 'group', 'correct'])
+    with ResultsWriter(results_path) as writer:
         # Write start marker (session start time = now - duration)
-        writer.writerow([
+        writer.write_row([
             (datetime.now() - timedelta(seconds=duration_seconds)).isoformat(),
             f"practice_{session_id}",
             pinyin_start,
@@ -275,7 +508,7 @@ def save_practice_time(results_path, session_id, duration_seconds, selected_grou
             'practice'
         ])
         # Write end marker (session end time = now)
-        writer.writerow([
+        writer.write_row([
             datetime.now().isoformat(),
             f"practice_{session_id}",
             pinyin_end,
@@ -318,17 +551,15 @@ def is_kitty():
     return os.environ.get('TERM') == 'xterm-kitty'
 
 
-def display_image_iterm2(image_data):
-    """Display image inline using iTerm2's escape sequence."""
-    b64_data = base64.b64encode(image_data).decode('ascii')
+def display_image_iterm2(b64_data):
+    """Display base64-encoded image inline using iTerm2's escape sequence."""
     # iTerm2 inline image protocol
     sys.stdout.write(f'\033]1337;File=inline=1;width=40;height=12;preserveAspectRatio=1:{b64_data}\a')
     sys.stdout.flush()
 
 
-def display_image_kitty(image_data):
-    """Display image inline using Kitty's escape sequence."""
-    b64_data = base64.b64encode(image_data).decode('ascii')
+def display_image_kitty(b64_data):
+    """Display base64-encoded image inline using Kitty's escape sequence."""
     # Kitty graphics protocol - chunked transmission
     chunk_size = 4096
     chunks = [b64_data[i:i+chunk_size] for i in range(0, len(b64_data), chunk_size)]
@@ -342,43 +573,75 @@ def display_image_kitty(image_data):
     sys.stdout.flush()
 
 
-def create_character_image(char, size=300):
-    """Create an image of the Chinese character."""
-    if not HAS_PIL:
-        return None
-
-    # Try to find a good font for Chinese characters
-    font = None
-    font_paths = [
-        # macOS fonts - Songti renders strokes correctly (dot vs horizontal) and has full SC support
-        '/System/Library/Fonts/Supplemental/Songti.ttc',
-        '/System/Library/Fonts/PingFang.ttc',
-        '/System/Library/Fonts/STHeiti Light.ttc',
-        '/System/Library/Fonts/Hiragino Sans GB.ttc',
-        '/Library/Fonts/Arial Unicode.ttf',
-        # Linux fonts
-        '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
-        '/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf',
-        # Windows fonts
-        'C:/Windows/Fonts/msyh.ttc',
-        'C:/Windows/Fonts/simsun.ttc',
-    ]
-
-    for font_path in font_paths:
-        if os.path.exists(font_path):
+# Fonts to try for Chinese characters, in order of preference
+FONT_PATHS = [
+    # macOS fonts - Songti renders strokes correctly (dot vs horizontal) and has full SC support
+    '/System/Library/Fonts/Supplemental/Songti.ttc',
+    '/System/Library/Fonts/PingFang.ttc',
+    '/System/Library/Fonts/STHeiti Light.ttc',
+    '/System/Library/Fonts/Hiragino Sans GB.ttc',
+    '/Library/Fonts/Arial Unicode.ttf',
+    # Linux fonts
+    '/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf',
+    # Windows fonts
+    'C:/Windows/Fonts/msyh.ttc',
+    'C:/Windows/Fonts/simsun.ttc',
+]
+# Default font (won't look as good for Chinese)
+FALLBACK_FONT_PATH = '/System/Library/Fonts/Helvetica.ttc'
+
+_font_path = None  # resolved on first use; '' means PIL's built-in font
+_fonts = {}        # loaded fonts by size
+
+
+def get_font_path():
+    """Find the font to render characters with, searching the candidates only once."""
+    global _font_path
+    if _font_path is None:
+        _font_path = ''
+        for font_path in FONT_PATHS:
+            if os.path.exists(font_path):
+                try:
+                    ImageFont.truetype(font_path, 12)
+                    _font_path = font_path
+                    break
+                except:
+                    continue
+        else:
             try:
-                font = ImageFont.truetype(font_path, size)
-                break
+                ImageFont.truetype(FALLBACK_FONT_PATH, 12)
+                _font_path = FALLBACK_FONT_PATH
             except:
-                continue
+                pass
+    return _font_path
+
 
+def get_font(size):
+    """Load the character font at the given size, once per size."""
+    font = _fonts.get(size)
     if font is None:
-        # Fall back to default font (won't look as good for Chinese)
-        try:
-            font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', size)
-        except:
-            font = ImageFont.load_default()
+        font_path = get_font_path()
+        font = ImageFont.truetype(font_path, size) if font_path else ImageFont.load_default()
+        _fonts[size] = font
+    return font
+
+
+def create_character_image(char, size=300):
+    """Create an image of the Chinese character (PNG bytes, cached on disk)."""
+    if not has_pil():
+        return None
+
+    # Reuse a previous rendering of this character if there is one
+    key = hashlib.blake2b(f"{IMAGE_RENDER_VERSION}-{char}-{size}-{get_font_path()}".encode('utf-8'), digest_size=8).hexdigest()
+    cache_path = IMAGE_CACHE_DIR / f"{key}.png"
+    try:
+        return cache_path.read_bytes()
+    except OSError:
+        pass
+
+    font = get_font(size)
 
     # Measure text size first to determine image dimensions
     temp_img = Image.new('RGB', (1, 1))
@@ -407,43 +670,47 @@ def create_character_image(char, size=300):
     # Save to bytes
     buffer = io.BytesIO()
     img.save(buffer, format='PNG')
-    return buffer.getvalue()
+    image_data = buffer.getvalue()
 
+    # Write through a temp file so an interrupted write never leaves a broken PNG
+    try:
+        IMAGE_CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        tmp_path.write_bytes(image_data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
-def display_huge_character(char):
-    """Display character in HUGE format - as image if possible, otherwise text."""
+    return image_data
+
+
+@lru_cache(maxsize=512)
+def character_image_b64(char, size):
+    """Base64-encoded character image, kept in memory for repeat cards."""
+    image_data = create_character_image(char, size=size)
+    if not image_data:
+        return None
+    return base64.b64encode(image_data).decode('ascii')
+
+
+@lru_cache(maxsize=2048)
+def huge_character_text(char):
+    """Build the text-mode HUGE character box (memoized per character)."""
     BOLD = '\033[1m'
     GREEN = '\033[92m'
     RESET = '\033[0m'
 
-    # Try to display as image
-    if HAS_PIL and (is_iterm2() or is_kitty()):
-        image_data = create_character_image(char, size=280)
-        if image_data:
-            print()
-            print()
-            if is_iterm2():
-                # Add padding for centering
-                print("      ", end='')
-                display_image_iterm2(image_data)
-            elif is_kitty():
-                display_image_kitty(image_data)
-            print()
-            print()
-            return
-
-    # Fallback to text-based display
     # Calculate width needed - each Chinese character is ~2 columns wide
     num_chars = len(char)
     char_visual_width = num_chars * 2  # Chinese chars are 2 columns wide
     min_width = char_visual_width + 20  # Padding around the character
     width = max(52, min_width)
 
-    print()
-    print(f"  {'█' * width}")
-    print(f"  █{' ' * (width-2)}█")
-    print(f"  █{' ' * (width-2)}█")
-    print(f"  █{' ' * (width-2)}█")
+    lines = ['']
+    lines.append(f"  {'█' * width}")
+    lines.append(f"  █{' ' * (width-2)}█")
+    lines.append(f"  █{' ' * (width-2)}█")
+    lines.append(f"  █{' ' * (width-2)}█")
 
     # Calculate centering - account for Chinese chars being 2 columns wide
     display_char = f"   {char}   "
@@ -452,35 +719,83 @@ def display_huge_character(char):
     left = (inner_width - display_visual_width) // 2
     right = inner_width - left - display_visual_width
 
-    print(f"  █{' ' * left}{BOLD}{GREEN}{display_char}{RESET}{' ' * right}█")
+    lines.append(f"  █{' ' * left}{BOLD}{GREEN}{display_char}{RESET}{' ' * right}█")
+
+    lines.append(f"  █{' ' * (width-2)}█")
+    lines.append(f"  █{' ' * (width-2)}█")
+    lines.append(f"  █{' ' * (width-2)}█")
+    lines.append(f"  {'█' * width}")
+    lines.append('')
+    return '\n'.join(lines) + '\n'
 
-    print(f"  █{' ' * (width-2)}█")
-    print(f"  █{' ' * (width-2)}█")
-    print(f"  █{' ' * (width-2)}█")
-    print(f"  {'█' * width}")
-    print()
+
+def huge_character_b64(char):
+    """Return the HUGE character image if this terminal can show it, else None."""
+    if (is_iterm2() or is_kitty()) and has_pil():
+        return character_image_b64(char, 280)
+    return None
+
+
+def display_huge_character(char):
+    """Display character in HUGE format - as image if possible, otherwise text."""
+    # Try to display as image
+    b64_data = huge_character_b64(char)
+    if b64_data:
+        if is_iterm2():
+            # Add padding for centering
+            sys.stdout.write("\n\n      ")
+            display_image_iterm2(b64_data)
+        elif is_kitty():
+            sys.stdout.write("\n\n")
+            display_image_kitty(b64_data)
+        write_lines(['', ''])
+        return
+
+    # Fallback to text-based display
+    sys.stdout.write(huge_character_text(char))
+    sys.stdout.flush()
+
+
+# ANSI color/style escape codes (zero display width)
+ANSI_RE = re.compile(r'\033\[[0-9;]*m')
+
+# CJK characters, emojis, and other wide characters
+WIDE_RANGES = (
+    (0x4E00, 0x9FFF),      # CJK Unified Ideographs
+    (0x3400, 0x4DBF),      # CJK Extension A
+    (0x1F000, 0x1FFFF),    # Emojis
+    (0x2600, 0x26FF),      # Misc symbols
+    (0x2700, 0x27BF),      # Dingbats
+)
+
+
+@lru_cache(maxsize=4096)
+def char_width(c):
+    """Get display width of a character (Chinese chars are 2 wide)."""
+    code = ord(c)
+    for lo, hi in WIDE_RANGES:
+        if lo <= code <= hi:
+            return 2
+    return 1
+
+
+def visible_width(text):
+    """Calculate visible width of text."""
+    return sum(map(char_width, text))
+
+
+# Menu box (inner width MENU_WIDTH), built once
+MENU_WIDTH = 50
+MENU_TOP = '╔' + '═' * MENU_WIDTH + '╗'
+MENU_DIVIDER = '╠' + '═' * MENU_WIDTH + '╣'
+MENU_BLANK = '║' + ' ' * MENU_WIDTH + '║'
+MENU_BOTTOM = '╚' + '═' * MENU_WIDTH + '╝'
 
 
 def display_menu(groups, has_results):
     """Display group selection menu."""
     clear_screen()
-    W = 50  # inner width
-
-    def char_width(c):
-        """Get display width of a character (Chinese chars are 2 wide)."""
-        code = ord(c)
-        # CJK characters, emojis, and other wide characters
-        if (0x4E00 <= code <= 0x9FFF or      # CJK Unified Ideographs
-            0x3400 <= code <= 0x4DBF or      # CJK Extension A
-            0x1F000 <= code <= 0x1FFFF or    # Emojis
-            0x2600 <= code <= 0x26FF or      # Misc symbols
-            0x2700 <= code <= 0x27BF):       # Dingbats
-            return 2
-        return 1
-
-    def visible_width(text):
-        """Calculate visible width of text."""
-        return sum(char_width(c) for c in text)
+    W = MENU_WIDTH  # inner width
 
     def pad(text, width=W):
         """Pad text to width, accounting for wide characters."""
@@ -488,137 +803,151 @@ def display_menu(groups, has_results):
         padding = width - vis_width
         return text + ' ' * max(0, padding)
 
-    print(f"╔{'═' * W}╗")
-    print(f"║{pad('       中文 CHINESE FLASHCARDS 中文')}║")
-    print(f"╠{'═' * W}╣")
-    print(f"║{' ' * W}║")
-    print(f"║{pad('  📚 TEST BY GROUP (random order, recorded):')}║")
+    lines = [MENU_TOP]
+    lines.append(f"║{pad('       中文 CHINESE FLASHCARDS 中文')}║")
+    lines.append(MENU_DIVIDER)
+    lines.append(MENU_BLANK)
+    lines.append(f"║{pad('  📚 TEST BY GROUP (random order, recorded):')}║")
 
     for g in groups:
         line = f"      [{g:2d}] Group {g}"
-        print(f"║{pad(line)}║")
+        lines.append(f"║{pad(line)}║")
 
-    print(f"║{pad('      [ 0] All groups')}║")
-    print(f"║{pad('      [1 2 3] Multiple groups (space-separated)')}║")
-    print(f"║{' ' * W}║")
+    lines.append(f"║{pad('      [ 0] All groups')}║")
+    lines.append(f"║{pad('      [1 2 3] Multiple groups (space-separated)')}║")
+    lines.append(MENU_BLANK)
 
-    print(f"║{pad('  📖 PRACTICE (in order, not recorded):')}║")
-    print(f"║{pad('      [ p] Practice all groups')}║")
-    print(f"║{pad('      [pN] Practice group N (e.g., p3)')}║")
-    print(f"║{pad('      [p 1 2 3] Practice multiple groups')}║")
+    lines.append(f"║{pad('  📖 PRACTICE (in order, not recorded):')}║")
+    lines.append(f"║{pad('      [ p] Practice all groups')}║")
+    lines.append(f"║{pad('      [pN] Practice group N (e.g., p3)')}║")
+    lines.append(f"║{pad('      [p 1 2 3] Practice multiple groups')}║")
     pd_text = "      [pd] Practice today's mistakes"
     pw_text = "      [pw] Practice this week's mistakes"
     pm_text = "      [pm] Practice this month's mistakes"
-    print(f"║{pad(pd_text)}║")
-    print(f"║{pad(pw_text)}║")
-    print(f"║{pad(pm_text)}║")
-    print(f"║{' ' * W}║")
+    lines.append(f"║{pad(pd_text)}║")
+    lines.append(f"║{pad(pw_text)}║")
+    lines.append(f"║{pad(pm_text)}║")
+    lines.append(MENU_BLANK)
 
     if has_results:
-        print(f"║{pad('  🔄 REVIEW MISTAKES (random, recorded):')}║")
-        print(f"║{pad('      [ d] Mistakes from today')}║")
-        print(f"║{pad('      [ w] Mistakes from this week')}║")
-        print(f"║{pad('      [ m] Mistakes from this month')}║")
-        print(f"║{' ' * W}║")
-
-    print(f"║{pad('  📊 STATISTICS:')}║")
-    print(f"║{pad('      [ s] View stats & charts')}║")
-    print(f"║{' ' * W}║")
-    print(f"║{pad('  📜 HISTORY:')}║")
-    print(f"║{pad('      [ h] View session history')}║")
-    print(f"║{' ' * W}║")
-    print(f"║{pad('      [quit] Quit')}║")
-    print(f"║{' ' * W}║")
-    print(f"╚{'═' * W}╝")
-    print()
-    return input("Enter choice: ").strip().lower()
+        lines.append(f"║{pad('  🔄 REVIEW MISTAKES (random, recorded):')}║")
+        lines.append(f"║{pad('      [ d] Mistakes from today')}║")
+        lines.append(f"║{pad('      [ w] Mistakes from this week')}║")
+        lines.append(f"║{pad('      [ m] Mistakes from this month')}║")
+        lines.append(MENU_BLANK)
+
+    lines.append(f"║{pad('  📊 STATISTICS:')}║")
+    lines.append(f"║{pad('      [ s] View stats & charts')}║")
+    lines.append(MENU_BLANK)
+    lines.append(f"║{pad('  📜 HISTORY:')}║")
+    lines.append(f"║{pad('      [ h] View session history')}║")
+    lines.append(MENU_BLANK)
+    lines.append(f"║{pad('      [quit] Quit')}║")
+    lines.append(MENU_BLANK)
+    lines.append(MENU_BOTTOM)
+    lines.append('')
+    write_lines(lines)
+    return prompt("Enter choice: ").strip().lower()
+
+
+# Horizontal rule under the card/pause status line and the stats list headings
+RULE_50 = '  ' + '─' * 50
+
+# Static parts of the card/pause screen lines, filled in with % on each redraw
+QUIZ_STATUS_TPL = "  \033[92m✓ %d\033[0m  \033[91m✗ %d\033[0m  │  Remaining: %d"
+PRACTICE_STATUS_TPL = "  \033[96m📖 PRACTICE MODE\033[0m  │  Card %d of %d"
+CARD_PINYIN_TPL = "  ║  \033[1mPinyin:\033[0m  %-36s ║"
+CARD_MEANING_TPL = "  ║  \033[1mMeaning:\033[0m %-36s ║"
+CARD_GROUP_TPL = "  ║  \033[1mGroup:\033[0m   %-36d ║"
+PRACTICE_FOOTER_BACK = "  \033[92m[SPACE]\033[0m Next   \033[96m[B]\033[0m Back   \033[93m[P]\033[0m Pause   [quit] Quit"
+PRACTICE_FOOTER = "  \033[92m[SPACE]\033[0m Next   \033[93m[P]\033[0m Pause   [quit] Quit"
+QUIZ_FOOTER = "  \033[92m[SPACE]\033[0m Correct   \033[91m[X]\033[0m Incorrect   \033[93m[P]\033[0m Pause   [quit] Quit"
+REVEAL_FOOTER = "  [SPACE] Reveal answer   \033[93m[P]\033[0m Pause"
 
 
 def display_paused_screen(practice_mode=False, correct_count=0, incorrect_count=0, remaining=0, current_num=0, total_num=0):
     """Display pause screen."""
-    clear_screen()
-
     YELLOW = '\033[93m'
-    CYAN = '\033[96m'
-    GREEN = '\033[92m'
-    RED = '\033[91m'
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
+    lines = []
+
     # Status line
     if practice_mode:
-        print(f"  {CYAN}📖 PRACTICE MODE{RESET}  │  Card {current_num} of {total_num}")
+        lines.append(PRACTICE_STATUS_TPL % (current_num, total_num))
     else:
-        print(f"  {GREEN}✓ {correct_count}{RESET}  {RED}✗ {incorrect_count}{RESET}  │  Remaining: {remaining}")
-    print("  " + "─" * 50)
-    print()
-
-    print()
-    print(f"  {BOLD}╔══════════════════════════════════════════════╗{RESET}")
-    print(f"  {BOLD}║{RESET}                                              {BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}          {YELLOW}⏸  SESSION PAUSED  ⏸{RESET}            {BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}                                              {BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}     Timer is paused. Take your time!        {BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}                                              {BOLD}║{RESET}")
-    print(f"  {BOLD}╚══════════════════════════════════════════════╝{RESET}")
-    print()
-    print(f"  {YELLOW}[P]{RESET} Resume   [quit] Quit")
-    print()
+        lines.append(QUIZ_STATUS_TPL % (correct_count, incorrect_count, remaining))
+    lines.append(RULE_50)
+    lines.append('')
+
+    lines.append('')
+    lines.append(f"  {BOLD}╔══════════════════════════════════════════════╗{RESET}")
+    lines.append(f"  {BOLD}║{RESET}                                              {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}          {YELLOW}⏸  SESSION PAUSED  ⏸{RESET}            {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}                                              {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}     Timer is paused. Take your time!        {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}                                              {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}╚══════════════════════════════════════════════╝{RESET}")
+    lines.append('')
+    lines.append(f"  {YELLOW}[P]{RESET} Resume   [quit] Quit")
+    lines.append('')
+    draw_screen(lines)
 
 
 def display_card(word, show_answer, correct_count, incorrect_count, remaining, practice_mode=False, current_num=0, total_num=0):
     """Display a flashcard."""
-    clear_screen()
-
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    CYAN = '\033[96m'
-    YELLOW = '\033[93m'
-    RESET = '\033[0m'
-    BOLD = '\033[1m'
+    lines = []
 
     # Status line
     if practice_mode:
-        print(f"  {CYAN}📖 PRACTICE MODE{RESET}  │  Card {current_num} of {total_num}")
+        lines.append(PRACTICE_STATUS_TPL % (current_num, total_num))
     else:
-        print(f"  {GREEN}✓ {correct_count}{RESET}  {RED}✗ {incorrect_count}{RESET}  │  Remaining: {remaining}")
-    print("  " + "─" * 50)
-    print()
+        lines.append(QUIZ_STATUS_TPL % (correct_count, incorrect_count, remaining))
+    lines.append(RULE_50)
+    lines.append('')
 
     # Card display
-    print("  ╔════════════════════════════════════════════════╗")
-    print("  ║                                                ║")
-    print(f"  ║  {BOLD}Pinyin:{RESET}  {word['pinyin']:<36} ║")
-    print("  ║                                                ║")
+    lines.append("  ╔════════════════════════════════════════════════╗")
+    lines.append("  ║                                                ║")
+    lines.append(CARD_PINYIN_TPL % word['pinyin'])
+    lines.append("  ║                                                ║")
 
     # Handle long meanings
     meaning = word['meaning']
     if len(meaning) > 36:
         meaning = meaning[:33] + "..."
-    print(f"  ║  {BOLD}Meaning:{RESET} {meaning:<36} ║")
-    print("  ║                                                ║")
-    print(f"  ║  {BOLD}Group:{RESET}   {word['group']:<36} ║")
-    print("  ║                                                ║")
-    print("  ╚════════════════════════════════════════════════╝")
+    lines.append(CARD_MEANING_TPL % meaning)
+    lines.append("  ║                                                ║")
+    lines.append(CARD_GROUP_TPL % word['group'])
+    lines.append("  ║                                                ║")
+    lines.append("  ╚════════════════════════════════════════════════╝")
 
     if show_answer:
-        display_huge_character(word['character'])
         if practice_mode:
-            if current_num > 1:
-                print(f"  {GREEN}[SPACE]{RESET} Next   {CYAN}[B]{RESET} Back   {YELLOW}[P]{RESET} Pause   [quit] Quit")
-            else:
-                print(f"  {GREEN}[SPACE]{RESET} Next   {YELLOW}[P]{RESET} Pause   [quit] Quit")
+            footer = PRACTICE_FOOTER_BACK if current_num > 1 else PRACTICE_FOOTER
         else:
-            print(f"  {GREEN}[SPACE]{RESET} Correct   {RED}[X]{RESET} Incorrect   {YELLOW}[P]{RESET} Pause   [quit] Quit")
+            footer = QUIZ_FOOTER
+
+        if huge_character_b64(word['character']):
+            # Inline images can't be patched line by line, so redraw everything
+            clear_screen()
+            write_lines(lines)
+            display_huge_character(word['character'])
+            write_lines([footer])
+            return
+        lines.extend(huge_character_text(word['character']).split('\n')[:-1])
+        lines.append(footer)
     else:
-        print()
-        print("  ┌────────────────────────────────────────────────┐")
-        print("  │                                                │")
-        print("  │                      ???                       │")
-        print("  │                                                │")
-        print("  └────────────────────────────────────────────────┘")
-        print()
-        print(f"  [SPACE] Reveal answer   {YELLOW}[P]{RESET} Pause")
+        lines.append('')
+        lines.append("  ┌────────────────────────────────────────────────┐")
+        lines.append("  │                                                │")
+        lines.append("  │                      ???                       │")
+        lines.append("  │                                                │")
+        lines.append("  └────────────────────────────────────────────────┘")
+        lines.append('')
+        lines.append(REVEAL_FOOTER)
+    draw_screen(lines)
 
 
 def calculate_stats(results, words):
@@ -649,78 +978,90 @@ def calculate_stats(results, words):
             'unique_chars': set(),
             'sessions': set()
         },
-        'by_character': defaultdict(lambda: {'correct': 0, 'incorrect': 0, 'last_seen': None}),
-        'by_date': defaultdict(lambda: {'correct': 0, 'incorrect': 0}),
-        'by_session': defaultdict(lambda: {'start': None, 'end': None, 'count': 0}),
         'all_chars': set(w['character'] for w in words)
     }
 
+    # Split practice markers (time tracking only) from test results once
+    practice_rows = []
+    test_rows = []
     for r in results:
-        char = r['character']
-        date_key = r['timestamp'].strftime('%Y-%m-%d')
-        session_id = r['session_id']
-
-        # Handle practice markers for time tracking only
-        if char == '_practice_':
-            # Track session timing for practice sessions
-            if stats['by_session'][session_id]['start'] is None or r['timestamp'] < stats['by_session'][session_id]['start']:
-                stats['by_session'][session_id]['start'] = r['timestamp']
-            if stats['by_session'][session_id]['end'] is None or r['timestamp'] > stats['by_session'][session_id]['end']:
-                stats['by_session'][session_id]['end'] = r['timestamp']
-
-            # Add to session sets for time calculations
-            stats['total']['sessions'].add(session_id)
-            if r['timestamp'] >= week_ago:
-                stats['week']['sessions'].add(session_id)
-            if r['timestamp'] >= today_start:
-                stats['today']['sessions'].add(session_id)
-
-            continue  # Skip the rest of stats for practice markers
-
-        # Regular test result stats
-        # Total stats
-        stats['total']['tested'] += 1
-        stats['total']['unique_chars'].add(char)
-        stats['total']['sessions'].add(session_id)
-        if r['correct']:
-            stats['total']['correct'] += 1
+        if r['character'] == '_practice_':
+            practice_rows.append(r)
         else:
-            stats['total']['incorrect'] += 1
-
-        # Weekly stats
-        if r['timestamp'] >= week_ago:
-            stats['week']['tested'] += 1
-            stats['week']['unique_chars'].add(char)
-            stats['week']['sessions'].add(session_id)
-            if r['correct']:
-                stats['week']['correct'] += 1
-            else:
-                stats['week']['incorrect'] += 1
-
-        # Today stats
-        if r['timestamp'] >= today_start:
-            stats['today']['tested'] += 1
-            stats['today']['unique_chars'].add(char)
-            stats['today']['sessions'].add(session_id)
-            if r['correct']:
-                stats['today']['correct'] += 1
-            else:
-                stats['today']['incorrect'] += 1
+            test_rows.append(r)
+
+    # Filter each time window once, then summarize it in bulk.
+    # today_start is always later than week_ago, so today is a subset of the week.
+    week_tests = [r for r in test_rows if r['timestamp'] >= week_ago]
+    today_tests = [r for r in week_tests if r['timestamp'] >= today_start]
+    week_practice = [r for r in practice_rows if r['timestamp'] >= week_ago]
+    today_practice = [r for r in week_practice if r['timestamp'] >= today_start]
+
+    for period, tests, practice in (('total', test_rows, practice_rows),
+                                    ('week', week_tests, week_practice),
+                                    ('today', today_tests, today_practice)):
+        correct = sum(r['correct'] for r in tests)
+        stats[period]['tested'] = len(tests)
+        stats[period]['correct'] = correct
+        stats[period]['incorrect'] = len(tests) - correct
+        stats[period]['unique_chars'] = {r['character'] for r in tests}
+        stats[period]['sessions'] = {r['session_id'] for r in tests}
+        stats[period]['sessions'].update(r['session_id'] for r in practice)
+
+    # Most rows share a handful of dates, so format each date only once
+    # (date.isoformat() gives the same 'YYYY-MM-DD' key as strftime)
+    date_strs = {}
+    date_keys = []
+    for r in test_rows:
+        day = r['timestamp'].date()
+        date_key = date_strs.get(day)
+        if date_key is None:
+            date_key = date_strs[day] = day.isoformat()
+        date_keys.append(date_key)
+    # Seed the per-character/date/session tables up front (in first-seen order)
+    # so the loops below use plain dict access instead of a defaultdict
+    # factory call for every new key
+    stats['by_character'] = {char: {'correct': 0, 'incorrect': 0, 'last_seen': None}
+                             for char in dict.fromkeys(r['character'] for r in test_rows)}
+    stats['by_date'] = {date_key: {'correct': 0, 'incorrect': 0} for date_key in dict.fromkeys(date_keys)}
+    stats['by_session'] = {session_id: {'start': None, 'end': None, 'count': 0}
+                           for session_id in dict.fromkeys(r['session_id'] for r in results)}
+
+    # Hot loops below work on local references rather than re-subscripting
+    # stats[...][key][...] several times per row
+    by_character = stats['by_character']
+    by_date = stats['by_date']
+    by_session = stats['by_session']
+
+    # Track session timing for practice sessions
+    for r in practice_rows:
+        ts = r['timestamp']
+        session = by_session[r['session_id']]
+        if session['start'] is None or ts < session['start']:
+            session['start'] = ts
+        if session['end'] is None or ts > session['end']:
+            session['end'] = ts
+
+    for r, date_key in zip(test_rows, date_keys):
+        ts = r['timestamp']
+        outcome = 'correct' if r['correct'] else 'incorrect'
 
         # Per-character stats
-        stats['by_character'][char]['correct' if r['correct'] else 'incorrect'] += 1
-        if stats['by_character'][char]['last_seen'] is None or r['timestamp'] > stats['by_character'][char]['last_seen']:
-            stats['by_character'][char]['last_seen'] = r['timestamp']
+        char_stats = by_character[r['character']]
+        char_stats[outcome] += 1
+        if char_stats['last_seen'] is None or ts > char_stats['last_seen']:
+            char_stats['last_seen'] = ts
 
         # Per-date stats
-        stats['by_date'][date_key]['correct' if r['correct'] else 'incorrect'] += 1
+        by_date[date_key][outcome] += 1
 
         # Per-session stats (for time tracking)
-        if stats['by_session'][session_id]['start'] is None or r['timestamp'] < stats['by_session'][session_id]['start']:
-            stats['by_session'][session_id]['start'] = r['timestamp']
-        if stats['by_session'][session_id]['end'] is None or r['timestamp'] > stats['by_session'][session_id]['end']:
-            stats['by_session'][session_id]['end'] = r['timestamp']
-        stats['by_session'][session_id]['count'] += 1
+        session = by_session[r['session_id']]
+        if session['start'] is None or ts < session['start']:
+            session['start'] = ts
+        if session['end'] is None or ts > session['end']:
+            session['end'] = ts
+        session['count'] += 1
 
     # Calculate new characters (in words but never tested)
     stats['new_chars'] = stats['all_chars'] - stats['total']['unique_chars']
@@ -746,6 +1087,37 @@ def calculate_stats(results, words):
     return stats
 
 
+# Memoized calculate_stats() result: {key: (stats, expires)}
+_stats_cache = {}
+
+
+def get_stats(results, words, results_path):
+    """Calculate statistics, reusing the last result if results.csv is unchanged."""
+    try:
+        st = results_path.stat()
+    except OSError:
+        return calculate_stats(results, words)
+
+    # Any write to results.csv bumps its mtime/size
+    key = (str(results_path), st.st_mtime_ns, st.st_size)
+    now = datetime.now()
+    cached = _stats_cache.get(key)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+
+    stats = calculate_stats(results, words)
+    # Even with no new rows the stats go stale when "today" rolls over at
+    # midnight, or when the oldest row of the rolling 7-day window drops out
+    expires = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    week_ago = now - timedelta(weeks=1)
+    oldest_in_week = min((r['timestamp'] for r in results if r['timestamp'] >= week_ago), default=None)
+    if oldest_in_week is not None:
+        expires = min(expires, oldest_in_week + timedelta(weeks=1))
+    _stats_cache.clear()
+    _stats_cache[key] = (stats, expires)
+    return stats
+
+
 def format_duration(seconds):
     """Format seconds into human-readable duration."""
     if seconds < 60:
@@ -760,33 +1132,50 @@ def format_duration(seconds):
         return f"{hours}h {mins}m"
 
 
+# Stats box (inner width STATS_WIDTH), built once
+STATS_WIDTH = 62
+STATS_TOP = '  \033[1m╔' + '═' * STATS_WIDTH + '╗\033[0m'
+STATS_DIVIDER = '  \033[1m╠' + '═' * STATS_WIDTH + '╣\033[0m'
+STATS_BLANK = '  \033[1m║\033[0m' + ' ' * STATS_WIDTH + '\033[1m║\033[0m'
+STATS_BOTTOM = '  \033[1m╚' + '═' * STATS_WIDTH + '╝\033[0m'
+
+# Rows of the TODAY / THIS WEEK / ALL TIME blocks, before padding to the box width
+STATS_SESSIONS_TPL = "    Sessions: %-10d Time: %s"
+STATS_TESTED_TPL = "    Total tested: %d"
+STATS_CORRECT_TPL = "    \033[92mCorrect:\033[0m %d"
+STATS_INCORRECT_TPL = "    \033[91mIncorrect:\033[0m %d"
+STATS_ACCURACY_TPL = "    Accuracy: %.1f%%"
+# Rows of the needing-work / mastered character lists
+STATS_WORST_ROW_TPL = "    %s (%s): \033[91m%d\033[0m/%d = %.0f%% errors"
+STATS_MASTERED_ROW_TPL = "    \033[92m★\033[0m %s (%s): %d/%d = 100%%"
+
+
 def display_stats(results, words, results_path):
     """Display statistics and generate charts."""
     clear_screen()
 
     if not results:
         print("\n  No results yet! Start practicing to see stats.\n")
-        input("  Press Enter to continue...")
+        prompt("  Press Enter to continue...")
         return
 
-    stats = calculate_stats(results, words)
+    stats = get_stats(results, words, results_path)
+    # First word per character, matching the old linear search
+    char_to_word = {w['character']: w for w in reversed(words)}
 
     BOLD = '\033[1m'
     GREEN = '\033[92m'
-    RED = '\033[91m'
     YELLOW = '\033[93m'
     CYAN = '\033[96m'
     MAGENTA = '\033[95m'
     RESET = '\033[0m'
 
     # Box width (inner content width)
-    W = 62
+    W = STATS_WIDTH
 
     def pad(text, width):
         """Pad text to width, accounting for ANSI codes."""
-        import re
-        visible = re.sub(r'\033\[[0-9;]*m', '', text)
-        padding = width - len(visible)
+        padding = width - len(ANSI_RE.sub('', text))
         return text + ' ' * max(0, padding)
 
     # Extract values for cleaner code
@@ -797,128 +1186,132 @@ def display_stats(results, words, results_path):
     time_week = format_duration(stats['time']['week'])
     time_total = format_duration(stats['time']['total'])
 
-    print()
-    print(f"  {BOLD}╔{'═' * W}╗{RESET}")
-    print(f"  {BOLD}║{RESET}{pad('                      📊 STATISTICS 📊', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}╠{'═' * W}╣{RESET}")
-    print(f"  {BOLD}║{RESET}{' ' * W}{BOLD}║{RESET}")
+    lines = ['']
+    lines.append(STATS_TOP)
+    lines.append(f"  {BOLD}║{RESET}{pad('                      📊 STATISTICS 📊', W)}{BOLD}║{RESET}")
+    lines.append(STATS_DIVIDER)
+    lines.append(STATS_BLANK)
 
     # Today stats
-    print(f"  {BOLD}║{RESET}  {MAGENTA}TODAY:{RESET}{' ' * (W - 8)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}  {MAGENTA}TODAY:{RESET}{' ' * (W - 8)}{BOLD}║{RESET}")
     sessions_today = len(today['sessions'])
-    line = f"    Sessions: {sessions_today:<10} Time: {time_today}"
-    print(f"  {BOLD}║{RESET}{pad(line, W)}{BOLD}║{RESET}")
+    line = STATS_SESSIONS_TPL % (sessions_today, time_today)
+    lines.append(f"  {BOLD}║{RESET}{pad(line, W)}{BOLD}║{RESET}")
     tested_today = today['tested']
     correct_today = today['correct']
     incorrect_today = today['incorrect']
-    print(f"  {BOLD}║{RESET}{pad(f'    Total tested: {tested_today}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {GREEN}Correct:{RESET} {correct_today}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {RED}Incorrect:{RESET} {incorrect_today}', W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_TESTED_TPL % tested_today, W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_CORRECT_TPL % correct_today, W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_INCORRECT_TPL % incorrect_today, W)}{BOLD}║{RESET}")
     if tested_today > 0:
         acc = correct_today / tested_today * 100
-        print(f"  {BOLD}║{RESET}{pad(f'    Accuracy: {acc:.1f}%', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{' ' * W}{BOLD}║{RESET}")
+        lines.append(f"  {BOLD}║{RESET}{pad(STATS_ACCURACY_TPL % acc, W)}{BOLD}║{RESET}")
+    lines.append(STATS_BLANK)
 
     # This week stats
-    print(f"  {BOLD}║{RESET}  {CYAN}THIS WEEK:{RESET}{' ' * (W - 12)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}  {CYAN}THIS WEEK:{RESET}{' ' * (W - 12)}{BOLD}║{RESET}")
     sessions_week = len(week['sessions'])
-    line = f"    Sessions: {sessions_week:<10} Time: {time_week}"
-    print(f"  {BOLD}║{RESET}{pad(line, W)}{BOLD}║{RESET}")
+    line = STATS_SESSIONS_TPL % (sessions_week, time_week)
+    lines.append(f"  {BOLD}║{RESET}{pad(line, W)}{BOLD}║{RESET}")
     tested_week = week['tested']
     correct_week = week['correct']
     incorrect_week = week['incorrect']
-    print(f"  {BOLD}║{RESET}{pad(f'    Total tested: {tested_week}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {GREEN}Correct:{RESET} {correct_week}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {RED}Incorrect:{RESET} {incorrect_week}', W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_TESTED_TPL % tested_week, W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_CORRECT_TPL % correct_week, W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_INCORRECT_TPL % incorrect_week, W)}{BOLD}║{RESET}")
     if tested_week > 0:
         acc = correct_week / tested_week * 100
-        print(f"  {BOLD}║{RESET}{pad(f'    Accuracy: {acc:.1f}%', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{' ' * W}{BOLD}║{RESET}")
+        lines.append(f"  {BOLD}║{RESET}{pad(STATS_ACCURACY_TPL % acc, W)}{BOLD}║{RESET}")
+    lines.append(STATS_BLANK)
 
     # All time stats
-    print(f"  {BOLD}║{RESET}  {YELLOW}ALL TIME:{RESET}{' ' * (W - 11)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}  {YELLOW}ALL TIME:{RESET}{' ' * (W - 11)}{BOLD}║{RESET}")
     sessions_total = len(total['sessions'])
-    line = f"    Sessions: {sessions_total:<10} Time: {time_total}"
-    print(f"  {BOLD}║{RESET}{pad(line, W)}{BOLD}║{RESET}")
+    line = STATS_SESSIONS_TPL % (sessions_total, time_total)
+    lines.append(f"  {BOLD}║{RESET}{pad(line, W)}{BOLD}║{RESET}")
     tested_total = total['tested']
     correct_total = total['correct']
     incorrect_total = total['incorrect']
     unique_chars = len(total['unique_chars'])
     new_chars = len(stats['new_chars'])
-    print(f"  {BOLD}║{RESET}{pad(f'    Total tested: {tested_total}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {GREEN}Correct:{RESET} {correct_total}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {RED}Incorrect:{RESET} {incorrect_total}', W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_TESTED_TPL % tested_total, W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_CORRECT_TPL % correct_total, W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(STATS_INCORRECT_TPL % incorrect_total, W)}{BOLD}║{RESET}")
 
     if tested_total > 0:
         acc = correct_total / tested_total * 100
-        print(f"  {BOLD}║{RESET}{pad(f'    Accuracy: {acc:.1f}%', W)}{BOLD}║{RESET}")
+        lines.append(f"  {BOLD}║{RESET}{pad(STATS_ACCURACY_TPL % acc, W)}{BOLD}║{RESET}")
 
-    print(f"  {BOLD}║{RESET}{pad(f'    Unique chars: {unique_chars}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{pad(f'    {YELLOW}New (untested):{RESET} {new_chars}', W)}{BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}{' ' * W}{BOLD}║{RESET}")
-    print(f"  {BOLD}╚{'═' * W}╝{RESET}")
-    print()
+    lines.append(f"  {BOLD}║{RESET}{pad(f'    Unique chars: {unique_chars}', W)}{BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}{pad(f'    {YELLOW}New (untested):{RESET} {new_chars}', W)}{BOLD}║{RESET}")
+    lines.append(STATS_BLANK)
+    lines.append(STATS_BOTTOM)
+    lines.append('')
 
     # Show worst performing characters (filter out practice markers)
-    char_stats = [(char, data) for char, data in stats['by_character'].items() if char != '_practice_']
-    char_stats.sort(key=lambda x: x[1]['incorrect'] / max(1, x[1]['correct'] + x[1]['incorrect']), reverse=True)
+    # (char, data, total, error rate, accuracy), computed once for both rankings
+    char_stats = []
+    for char, data in stats['by_character'].items():
+        if char == '_practice_':
+            continue
+        total = data['correct'] + data['incorrect']
+        attempts = max(1, total)
+        char_stats.append((char, data, total, data['incorrect'] / attempts, data['correct'] / attempts))
 
-    print(f"  {BOLD}CHARACTERS NEEDING WORK (highest error rate):{RESET}")
-    print(f"  {'─' * 50}")
+    lines.append(f"  {BOLD}CHARACTERS NEEDING WORK (highest error rate):{RESET}")
+    lines.append(RULE_50)
 
     shown = 0
-    for char, data in char_stats[:10]:
-        total = data['correct'] + data['incorrect']
+    for char, data, total, error_rate, _ in heapq.nlargest(10, char_stats, key=itemgetter(3)):
         if total > 0 and data['incorrect'] > 0:
-            error_rate = data['incorrect'] / total * 100
+            error_rate *= 100
             # Find pinyin for this character
-            pinyin = next((w['pinyin'] for w in words if w['character'] == char), '?')
-            print(f"    {char} ({pinyin}): {RED}{data['incorrect']}{RESET}/{total} = {error_rate:.0f}% errors")
+            word = char_to_word.get(char)
+            pinyin = word['pinyin'] if word else '?'
+            lines.append(STATS_WORST_ROW_TPL % (char, pinyin, data['incorrect'], total, error_rate))
             shown += 1
 
     if shown == 0:
-        print(f"    {GREEN}No mistakes yet! Keep up the great work!{RESET}")
+        lines.append(f"    {GREEN}No mistakes yet! Keep up the great work!{RESET}")
 
-    print()
+    lines.append('')
 
     # Show best performing characters
-    char_stats.sort(key=lambda x: x[1]['correct'] / max(1, x[1]['correct'] + x[1]['incorrect']), reverse=True)
+    candidates = [cs for cs in char_stats if cs[2] >= 5 and cs[1]['incorrect'] == 0]
+    mastered = heapq.nlargest(10, candidates, key=itemgetter(4))
 
-    print(f"  {BOLD}MASTERED CHARACTERS (highest accuracy, 5+ attempts):{RESET}")
-    print(f"  {'─' * 50}")
+    lines.append(f"  {BOLD}MASTERED CHARACTERS (highest accuracy, 5+ attempts):{RESET}")
+    lines.append(RULE_50)
 
-    shown = 0
-    for char, data in char_stats:
-        total = data['correct'] + data['incorrect']
-        if total >= 5 and data['incorrect'] == 0:
-            pinyin = next((w['pinyin'] for w in words if w['character'] == char), '?')
-            print(f"    {GREEN}★{RESET} {char} ({pinyin}): {total}/{total} = 100%")
-            shown += 1
-            if shown >= 10:
-                break
+    for char, data, total, _, _ in mastered:
+        word = char_to_word.get(char)
+        pinyin = word['pinyin'] if word else '?'
+        lines.append(STATS_MASTERED_ROW_TPL % (char, pinyin, total, total))
 
-    if shown == 0:
-        print(f"    Keep practicing to master characters!")
+    if not mastered:
+        lines.append(f"    Keep practicing to master characters!")
 
-    print()
-    print("  [p] Generate performance plots")
-    print("  [Enter] Return to menu")
+    lines.append('')
+    lines.append("  [p] Generate performance plots")
+    lines.append("  [Enter] Return to menu")
 
-    choice = input("\n  Choice: ").strip().lower()
+    write_lines(lines)
+    choice = prompt("\n  Choice: ").strip().lower()
 
     if choice == 'p':
         generate_plots(stats, words, results_path.parent)
 
 
+# (figure, axes) reused by every generate_plots() call after the first
+_plot_figure = None
+
+
 def generate_plots(stats, words, output_dir):
     """Generate performance plots."""
-    try:
-        import matplotlib.pyplot as plt
-        import matplotlib
-        matplotlib.use('Agg')  # Non-interactive backend
-    except ImportError:
+    global _plot_figure
+    if not has_matplotlib():
         print("\n  matplotlib not installed. Install with: pip install matplotlib")
-        input("  Press Enter to continue...")
+        prompt("  Press Enter to continue...")
         return
 
     GREEN = '\033[92m'
@@ -926,16 +1319,21 @@ def generate_plots(stats, words, output_dir):
 
     print("\n  Generating plots...")
 
-    # Create figure with multiple subplots
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    # Create figure with multiple subplots once, then just clear them on later calls
+    if _plot_figure is None:
+        _plot_figure = plt.subplots(2, 2, figsize=(14, 10))
+    fig, axes = _plot_figure
+    for ax in axes.flat:
+        ax.clear()
     fig.suptitle('Chinese Flashcard Performance', fontsize=16, fontweight='bold')
 
     # 1. Daily performance over time
     ax1 = axes[0, 0]
-    dates = sorted(stats['by_date'].keys())[-30:]  # Last 30 days
+    dates = sorted(heapq.nlargest(30, stats['by_date']))  # Last 30 days, oldest first
     if dates:
-        correct_vals = [stats['by_date'][d]['correct'] for d in dates]
-        incorrect_vals = [stats['by_date'][d]['incorrect'] for d in dates]
+        by_date = stats['by_date']
+        correct_vals = np.fromiter((by_date[d]['correct'] for d in dates), dtype=np.int64, count=len(dates))
+        incorrect_vals = np.fromiter((by_date[d]['incorrect'] for d in dates), dtype=np.int64, count=len(dates))
 
         x = range(len(dates))
         ax1.bar(x, correct_vals, label='Correct', color='#4CAF50', alpha=0.8)
@@ -955,14 +1353,17 @@ def generate_plots(stats, words, output_dir):
 
     # 2. Character difficulty (error rate)
     ax2 = axes[0, 1]
-    char_data = [(char, data) for char, data in stats['by_character'].items()]
-    char_data = [(c, d) for c, d in char_data if d['correct'] + d['incorrect'] >= 3]  # Min 3 attempts
-    char_data.sort(key=lambda x: x[1]['incorrect'] / max(1, x[1]['correct'] + x[1]['incorrect']), reverse=True)
+    # (char, error rate) for characters with at least 3 attempts
+    char_data = []
+    for char, data in stats['by_character'].items():
+        total = data['correct'] + data['incorrect']
+        if total >= 3:
+            char_data.append((char, data['incorrect'] / total))
 
     if char_data:
-        top_difficult = char_data[:15]
+        top_difficult = heapq.nlargest(15, char_data, key=itemgetter(1))
         chars = [c for c, _ in top_difficult]
-        error_rates = [d['incorrect'] / (d['correct'] + d['incorrect']) * 100 for _, d in top_difficult]
+        error_rates = [rate * 100 for _, rate in top_difficult]
 
         colors = ['#f44336' if r > 50 else '#FF9800' if r > 25 else '#4CAF50' for r in error_rates]
         bars = ax2.barh(range(len(chars)), error_rates, color=colors)
@@ -978,21 +1379,19 @@ def generate_plots(stats, words, output_dir):
 
     # 3. Accuracy by group
     ax3 = axes[1, 0]
-    group_stats = defaultdict(lambda: {'correct': 0, 'incorrect': 0})
-    for char, data in stats['by_character'].items():
-        # Find group for this character
-        word = next((w for w in words if w['character'] == char), None)
-        if word:
-            group_stats[word['group']]['correct'] += data['correct']
-            group_stats[word['group']]['incorrect'] += data['incorrect']
-
-    if group_stats:
-        groups = sorted(group_stats.keys())
-        accuracies = []
-        for g in groups:
-            total = group_stats[g]['correct'] + group_stats[g]['incorrect']
-            acc = group_stats[g]['correct'] / total * 100 if total > 0 else 0
-            accuracies.append(acc)
+    # Group of the first word per character, matching the old linear search
+    char_to_group = {w['character']: w['group'] for w in reversed(words)}
+    char_counts = [(char_to_group[char], data['correct'], data['incorrect'])
+                   for char, data in stats['by_character'].items() if char in char_to_group]
+
+    if char_counts:
+        # Sum correct/incorrect per group number in one pass each
+        group_ids, correct, incorrect = np.array(char_counts, dtype=np.int64).T
+        correct_by_group = np.bincount(group_ids, weights=correct)
+        incorrect_by_group = np.bincount(group_ids, weights=incorrect)
+        groups = np.flatnonzero(np.bincount(group_ids))  # groups that have characters
+        totals = correct_by_group[groups] + incorrect_by_group[groups]
+        accuracies = np.where(totals > 0, correct_by_group[groups] / np.maximum(totals, 1) * 100, 0)
 
         colors = ['#4CAF50' if a >= 80 else '#FF9800' if a >= 60 else '#f44336' for a in accuracies]
         ax3.bar([f'G{g}' for g in groups], accuracies, color=colors)
@@ -1013,21 +1412,17 @@ def generate_plots(stats, words, output_dir):
     untested_chars = len(stats['new_chars'])
 
     # Calculate mastered (>80% accuracy with 5+ attempts)
-    mastered = 0
-    learning = 0
-    struggling = 0
-    for char, data in stats['by_character'].items():
-        total = data['correct'] + data['incorrect']
-        if total >= 5:
-            acc = data['correct'] / total
-            if acc >= 0.8:
-                mastered += 1
-            elif acc >= 0.5:
-                learning += 1
-            else:
-                struggling += 1
-        elif total > 0:
-            learning += 1
+    counts = np.array([(data['correct'], data['incorrect']) for data in stats['by_character'].values()],
+                      dtype=np.int64).reshape(-1, 2)
+    correct, incorrect = counts.T
+    total = correct + incorrect
+    acc = correct / np.maximum(total, 1)
+    enough = total >= 5
+    # Label every character 0=mastered, 1=learning, 2=struggling, 3=no attempts (first match
+    # wins), then tally the labels in a single bincount
+    category = np.select([enough & (acc >= 0.8), enough & (acc >= 0.5), enough, total > 0],
+                         [0, 1, 2, 1], default=3)
+    mastered, learning, struggling = np.bincount(category, minlength=4)[:3].tolist()
 
     sizes = [mastered, learning, struggling, untested_chars]
     labels = [f'Mastered\n({mastered})', f'Learning\n({learning})', f'Struggling\n({struggling})', f'Untested\n({untested_chars})']
@@ -1044,12 +1439,13 @@ def generate_plots(stats, words, output_dir):
         ax4.text(0.5, 0.5, 'No data yet', ha='center', va='center', transform=ax4.transAxes)
         ax4.set_title('Character Mastery')
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     # Save the plot
     plot_path = output_dir / 'performance_chart.png'
-    plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    # Screen-resolution PNG with light compression; tight_layout() above already fits the
+    # subplots, so skip bbox_inches='tight' and the extra render pass it costs
+    fig.savefig(plot_path, dpi=100, pil_kwargs={'compress_level': 1})
 
     print(f"\n  {GREEN}✓{RESET} Charts saved to: {plot_path}")
 
@@ -1064,7 +1460,7 @@ def generate_plots(stats, words, output_dir):
     except:
         pass
 
-    input("\n  Press Enter to continue...")
+    prompt("\n  Press Enter to continue...")
 
 
 def run_practice(words, selected_groups, results_path, mistake_mode=None, all_results=None):
@@ -1073,7 +1469,8 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
     debug_log("run_practice() STARTED")
 
     # Flush any pending input (e.g., from mouse events)
-    flush_stdin()
+    keys = KeyReader()
+    keys.flush()
 
     # Filter words by selected groups or mistakes
     if mistake_mode and all_results:
@@ -1082,7 +1479,7 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
             clear_screen()
             print(f"\n  No mistakes found for the selected time period!")
             print("  Great job - or try testing first!\n")
-            input("  Press Enter to continue...")
+            prompt("  Press Enter to continue...")
             return
     elif 0 in selected_groups:  # All groups
         practice_words = words.copy()
@@ -1093,8 +1490,9 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
         print("No words found for selected groups!")
         return
 
-    # Sort by group, then by order in file (don't shuffle)
-    practice_words.sort(key=lambda w: (w['group'], words.index(w)))
+    # Sort by group, then by order in file (don't shuffle). practice_words is
+    # already in file order and sort() is stable, so the group is the only key.
+    practice_words.sort(key=itemgetter('group'))
 
     # Track time and pause state
     start_time = datetime.now()
@@ -1110,18 +1508,20 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
 
         while True:
             display_paused_screen(practice_mode=True, current_num=current_num, total_num=total_words)
-            key = get_key()
-            debug_log(f"Pause screen got key: {repr(key)}")
+            key = keys.next_event()
+            if DEBUG_LOG:
+                debug_log(f"Pause screen got key: {repr(key)}")
 
             if key is None:
                 continue
-            if key.lower() == 'p':
+            if key in PAUSE_KEYS:
                 # Resume - calculate paused time
                 pause_duration = (datetime.now() - pause_start).total_seconds()
                 total_paused_time += pause_duration
-                debug_log(f"Resuming - paused for {pause_duration:.1f}s, total paused: {total_paused_time:.1f}s")
+                if DEBUG_LOG:
+                    debug_log(f"Resuming - paused for {pause_duration:.1f}s, total paused: {total_paused_time:.1f}s")
                 return
-            elif check_for_quit(key):
+            elif key == QUIT:
                 # User quit during pause
                 pause_duration = (datetime.now() - pause_start).total_seconds()
                 total_paused_time += pause_duration
@@ -1131,7 +1531,7 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
                 print(f"\n  Practice session ended after viewing {current_num - 1} of {total_words} cards.")
                 print(f"  Time spent: {format_duration(duration)}")
                 print()
-                input("  Press Enter to continue...")
+                prompt("  Press Enter to continue...")
                 raise SystemExit()  # Exit to break out of nested loops
 
     # Navigation with back support
@@ -1143,24 +1543,27 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
 
                 # Show question (hidden answer)
             display_card(word, False, 0, 0, 0, practice_mode=True, current_num=current_num, total_num=total_words)
-            debug_log(f"run_practice() showing card {current_num} of {total_words}")
+            if DEBUG_LOG:
+                debug_log(f"run_practice() showing card {current_num} of {total_words}")
 
             while True:
-                key = get_key()
-                debug_log(f"run_practice() question loop got key: {repr(key)}")
+                key = keys.next_event()
+                if DEBUG_LOG:
+                    debug_log(f"run_practice() question loop got key: {repr(key)}")
                 if key is None:
                     continue  # Ignore escape sequences
                 if key == ' ':
                     break
-                elif key.lower() == 'p':
+                elif key in PAUSE_KEYS:
                     handle_pause(current_num)
                     display_card(word, False, 0, 0, 0, practice_mode=True, current_num=current_num, total_num=total_words)
-                elif key.lower() == 'b' and i > 0:
+                elif key in BACK_KEYS and i > 0:
                     # Go back to previous card
                     i -= 1
-                    debug_log(f"run_practice() going back to card {i}")
+                    if DEBUG_LOG:
+                        debug_log(f"run_practice() going back to card {i}")
                     break
-                elif check_for_quit(key):
+                elif key == QUIT:
                     debug_log("run_practice() QUITTING from question loop")
                     # Save practice time before quitting
                     duration = (datetime.now() - start_time).total_seconds() - total_paused_time
@@ -1169,7 +1572,7 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
                     print(f"\n  Practice session ended after viewing {current_num - 1} of {total_words} cards.")
                     print(f"  Time spent: {format_duration(duration)}")
                     print()
-                    input("  Press Enter to continue...")
+                    prompt("  Press Enter to continue...")
                     return
 
             # If we went back, continue to show the previous card
@@ -1178,25 +1581,28 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
 
             # Show answer
             display_card(word, True, 0, 0, 0, practice_mode=True, current_num=current_num, total_num=total_words)
-            debug_log(f"run_practice() showing answer for card {current_num}")
+            if DEBUG_LOG:
+                debug_log(f"run_practice() showing answer for card {current_num}")
 
             while True:
-                key = get_key()
-                debug_log(f"run_practice() answer loop got key: {repr(key)}")
+                key = keys.next_event()
+                if DEBUG_LOG:
+                    debug_log(f"run_practice() answer loop got key: {repr(key)}")
                 if key is None:
                     continue  # Ignore escape sequences
                 if key == ' ':
                     i += 1  # Move to next card
                     break
-                elif key.lower() == 'p':
+                elif key in PAUSE_KEYS:
                     handle_pause(current_num)
                     display_card(word, True, 0, 0, 0, practice_mode=True, current_num=current_num, total_num=total_words)
-                elif key.lower() == 'b' and i > 0:
+                elif key in BACK_KEYS and i > 0:
                     # Go back to previous card
                     i -= 1
-                    debug_log(f"run_practice() going back to card {i}")
+                    if DEBUG_LOG:
+                        debug_log(f"run_practice() going back to card {i}")
                     break
-                elif check_for_quit(key):
+                elif key == QUIT:
                     debug_log("run_practice() QUITTING from answer loop")
                     # Save practice time before quitting
                     duration = (datetime.now() - start_time).total_seconds() - total_paused_time
@@ -1205,7 +1611,7 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
                     print(f"\n  Practice session ended after viewing {current_num} of {total_words} cards.")
                     print(f"  Time spent: {format_duration(duration)}")
                     print()
-                    input("  Press Enter to continue...")
+                    prompt("  Press Enter to continue...")
                     return
     except SystemExit:
         # Clean exit from pause handler
@@ -1229,13 +1635,14 @@ def run_practice(words, selected_groups, results_path, mistake_mode=None, all_re
     print(f"  {BOLD}║{RESET}                                          {BOLD}║{RESET}")
     print(f"  {BOLD}╚══════════════════════════════════════════╝{RESET}")
     print()
-    input("  Press Enter to continue...")
+    prompt("  Press Enter to continue...")
 
 
 def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_results=None):
     """Run the flashcard quiz."""
     # Flush any pending input (e.g., from mouse events)
-    flush_stdin()
+    keys = KeyReader()
+    keys.flush()
 
     # Filter words by selected groups or mistakes
     if mistake_mode and all_results:
@@ -1244,7 +1651,7 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
             clear_screen()
             print(f"\n  No mistakes found for the selected time period!")
             print("  Great job - or try practicing first!\n")
-            input("  Press Enter to continue...")
+            prompt("  Press Enter to continue...")
             return
     elif 0 in selected_groups:  # All groups
         quiz_words = words.copy()
@@ -1274,29 +1681,41 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
         while True:
             display_paused_screen(practice_mode=False, correct_count=correct_count,
                                 incorrect_count=incorrect_count, remaining=calc_remaining())
-            key = get_key()
-            debug_log(f"Pause screen (quiz) got key: {repr(key)}")
+            key = keys.next_event()
+            if DEBUG_LOG:
+                debug_log(f"Pause screen (quiz) got key: {repr(key)}")
 
             if key is None:
                 continue
-            if key.lower() == 'p':
+            if key in PAUSE_KEYS:
                 # Resume - calculate paused time
                 pause_duration = (datetime.now() - pause_start).total_seconds()
                 total_paused_time += pause_duration
-                debug_log(f"Resuming (quiz) - paused for {pause_duration:.1f}s, total paused: {total_paused_time:.1f}s")
+                if DEBUG_LOG:
+                    debug_log(f"Resuming (quiz) - paused for {pause_duration:.1f}s, total paused: {total_paused_time:.1f}s")
                 return
-            elif check_for_quit(key):
+            elif key == QUIT:
                 # User quit during pause
                 pause_duration = (datetime.now() - pause_start).total_seconds()
                 total_paused_time += pause_duration
                 show_final_score(correct_count, incorrect_count)
                 raise SystemExit()  # Exit to break out of nested loops
 
-    # Queue: list of (word, times_correct_needed)
-    queue = [(w, 0) for w in quiz_words]
+    # Queue: deque of (word, times_correct_needed); repeats go back in near the front
+    queue = deque((w, 0) for w in quiz_words)
 
-    # Track words that need repetition
+    # Track words that need repetition: pinyin -> (word, streak, insert_pos)
     repeat_words = {}
+    # Heap of (insert_pos, seq, pinyin, entry) so due repeats are found without
+    # scanning repeat_words; entries replaced in repeat_words are skipped when popped
+    repeat_due = []
+    repeat_seq = count()
+
+    def schedule_repeat(word, streak, insert_pos):
+        """Queue word to come back with streak correct answers needed at insert_pos."""
+        entry = (word, streak, insert_pos)
+        repeat_words[word['pinyin']] = entry
+        heapq.heappush(repeat_due, (insert_pos, next(repeat_seq), word['pinyin'], entry))
 
     def calc_remaining():
         """Calculate total remaining including repeat words."""
@@ -1308,19 +1727,21 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
 
     position = 0
 
+    # One open results file for the whole session instead of one per answer
+    results_writer = ResultsWriter(results_path)
+
     try:
         while queue:
-            word, needed_correct = queue.pop(0)
+            word, needed_correct = queue.popleft()
             remaining = calc_remaining() + max(1, needed_correct)
 
             # Add any repeat words that are due
-            words_to_insert = []
-            for pinyin, (rw, streak_needed, insert_pos) in list(repeat_words.items()):
-                if position >= insert_pos:
-                    words_to_insert.append((rw, streak_needed))
-                    del repeat_words[pinyin]
-
-            for rw, streak in words_to_insert:
+            while repeat_due and repeat_due[0][0] <= position:
+                _, _, pinyin, entry = heapq.heappop(repeat_due)
+                if repeat_words.get(pinyin) is not entry:
+                    continue  # superseded by a later schedule_repeat()
+                del repeat_words[pinyin]
+                rw, streak, _ = entry
                 insert_idx = random.randint(0, min(3, len(queue)))
                 queue.insert(insert_idx, (rw, streak))
 
@@ -1330,15 +1751,15 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
             display_card(word, False, correct_count, incorrect_count, remaining)
 
             while True:
-                key = get_key()
+                key = keys.next_event()
                 if key is None:
                     continue  # Ignore escape sequences
                 if key == ' ':
                     break
-                elif key.lower() == 'p':
+                elif key in PAUSE_KEYS:
                     handle_pause()
                     display_card(word, False, correct_count, incorrect_count, remaining)
-                elif check_for_quit(key):
+                elif key == QUIT:
                     show_final_score(correct_count, incorrect_count)
                     return
 
@@ -1346,31 +1767,31 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
             display_card(word, True, correct_count, incorrect_count, remaining)
 
             while True:
-                key = get_key()
+                key = keys.next_event()
                 if key is None:
                     continue  # Ignore escape sequences
                 if key == ' ':
                     correct_count += 1
-                    save_result(results_path, word, True, session_id, selected_groups)
+                    results_writer.record(word, True, session_id)
 
                     if needed_correct > 1:
                         insert_pos = position + random.randint(5, 10)
-                        repeat_words[word['pinyin']] = (word, needed_correct - 1, insert_pos)
+                        schedule_repeat(word, needed_correct - 1, insert_pos)
                     break
-                elif key.lower() == 'p':
+                elif key in PAUSE_KEYS:
                     handle_pause()
                     display_card(word, True, correct_count, incorrect_count, remaining)
-                elif key.lower() == 'x':
+                elif key in WRONG_KEYS:
                     incorrect_count += 1
-                    save_result(results_path, word, False, session_id, selected_groups)
+                    results_writer.record(word, False, session_id)
 
                     insert_pos = position + random.randint(5, 10)
-                    repeat_words[word['pinyin']] = (word, 2, insert_pos)
+                    schedule_repeat(word, 2, insert_pos)
                     # Refresh display to show updated remaining count
                     remaining = calc_remaining()
                     display_card(word, True, correct_count, incorrect_count, remaining)
                     break
-                elif check_for_quit(key):
+                elif key == QUIT:
                     show_final_score(correct_count, incorrect_count)
                     return
 
@@ -1390,36 +1811,36 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
                 display_card(word, False, correct_count, incorrect_count, remaining)
 
                 while True:
-                    key = get_key()
+                    key = keys.next_event()
                     if key is None:
                         continue  # Ignore escape sequences
                     if key == ' ':
                         break
-                    elif key.lower() == 'p':
+                    elif key in PAUSE_KEYS:
                         handle_pause()
                         display_card(word, False, correct_count, incorrect_count, remaining)
-                    elif check_for_quit(key):
+                    elif key == QUIT:
                         show_final_score(correct_count, incorrect_count)
                         return
 
                 display_card(word, True, correct_count, incorrect_count, remaining)
 
                 while True:
-                    key = get_key()
+                    key = keys.next_event()
                     if key is None:
                         continue  # Ignore escape sequences
                     if key == ' ':
                         correct_count += 1
-                        save_result(results_path, word, True, session_id, selected_groups)
+                        results_writer.record(word, True, session_id)
                         if streak_needed > 1:
                             repeat_words[word['pinyin']] = (word, streak_needed - 1, 0)
                         break
-                    elif key.lower() == 'p':
+                    elif key in PAUSE_KEYS:
                         handle_pause()
                         display_card(word, True, correct_count, incorrect_count, remaining)
-                    elif key.lower() == 'x':
+                    elif key in WRONG_KEYS:
                         incorrect_count += 1
-                        save_result(results_path, word, False, session_id, selected_groups)
+                        results_writer.record(word, False, session_id)
                         repeat_words[word['pinyin']] = (word, 2, 0)
                         # Refresh display to show updated remaining count
                         pending_after = sum(s for _, s in pending[idx+1:])
@@ -1427,24 +1848,35 @@ def run_quiz(words, selected_groups, results_path, mistake_mode=None, all_result
                         remaining = pending_after + new_repeats
                         display_card(word, True, correct_count, incorrect_count, remaining)
                         break
-                    elif check_for_quit(key):
+                    elif key == QUIT:
                         show_final_score(correct_count, incorrect_count)
                         return
     except SystemExit:
         # Clean exit from pause handler
         return
+    finally:
+        results_writer.close()
 
     # Quiz complete
     show_final_score(correct_count, incorrect_count, complete=True)
 
 
+# Per-session lines of the history list
+HISTORY_SESSION_TPL = "  \033[1m%s\033[0m  │  %s  │  %s"
+HISTORY_TEST_TPL = "TEST    %s(%.0f%% acc)\033[0m"
+HISTORY_DURATION_TPL = "      Duration: %s"
+
+# Group list encoded in multi-group practice markers, e.g. _practice_start_1,2,5_
+PRACTICE_GROUPS_RE = re.compile(r'_practice_(?:start|end)_([0-9,]+)_')
+
+
 def display_history(results, words):
     """Display session history."""
     clear_screen()
 
     if not results:
         print("\n  No session history yet! Start practicing or testing to see history.\n")
-        input("  Press Enter to continue...")
+        prompt("  Press Enter to continue...")
         return
 
     BOLD = '\033[1m'
@@ -1455,50 +1887,51 @@ def display_history(results, words):
     YELLOW = '\033[93m'
     RESET = '\033[0m'
 
-    # Group results by session
-    sessions = defaultdict(lambda: {
-        'start': None,
-        'end': None,
-        'is_practice': False,
-        'results': [],
-        'groups': set()
-    })
-
-    for r in results:
-        session_id = r['session_id']
-        sessions[session_id]['results'].append(r)
-
-        if r['character'] == '_practice_':
-            sessions[session_id]['is_practice'] = True
-            # Extract groups from practice marker
-            if r['group'] == -1:
-                # Multiple groups encoded in pinyin
-                import re
-                match = re.search(r'_practice_(?:start|end)_([0-9,]+)_', r['pinyin'])
-                if match:
-                    groups_str = match.group(1)
-                    sessions[session_id]['groups'] = set(map(int, groups_str.split(',')))
-            elif r['group'] == 0:
-                sessions[session_id]['groups'] = {0}  # All groups
+    # Group results by session: one stable sort puts each session's rows in a
+    # contiguous run (in their original order), then groupby walks the runs
+    session_key = itemgetter('session_id')
+    sessions = {}
+    for session_id, rows in groupby(sorted(results, key=session_key), key=session_key):
+        session_data = {'is_practice': False, 'groups': set(), 'correct': 0, 'incorrect': 0}
+        timestamps = []
+
+        for r in rows:
+            timestamps.append(r['timestamp'])
+
+            if r['character'] == '_practice_':
+                session_data['is_practice'] = True
+                # Extract groups from practice marker
+                if r['group'] == -1:
+                    # Multiple groups encoded in pinyin
+                    match = PRACTICE_GROUPS_RE.search(r['pinyin'])
+                    if match:
+                        groups_str = match.group(1)
+                        session_data['groups'] = set(map(int, groups_str.split(',')))
+                elif r['group'] == 0:
+                    session_data['groups'] = {0}  # All groups
+                else:
+                    session_data['groups'] = {r['group']}
             else:
-                sessions[session_id]['groups'] = {r['group']}
-        else:
-            # Regular test result - add this word's group
-            sessions[session_id]['groups'].add(r['group'])
+                # Regular test result - add this word's group and score it
+                session_data['groups'].add(r['group'])
+                if r['correct']:
+                    session_data['correct'] += 1
+                else:
+                    session_data['incorrect'] += 1
 
-        if sessions[session_id]['start'] is None or r['timestamp'] < sessions[session_id]['start']:
-            sessions[session_id]['start'] = r['timestamp']
-        if sessions[session_id]['end'] is None or r['timestamp'] > sessions[session_id]['end']:
-            sessions[session_id]['end'] = r['timestamp']
+        # Session span from its earliest and latest rows
+        session_data['start'] = min(timestamps)
+        session_data['end'] = max(timestamps)
+        sessions[session_id] = session_data
 
     # Sort sessions by start time (most recent first)
     sorted_sessions = sorted(sessions.items(), key=lambda x: x[1]['start'], reverse=True)
 
-    print()
-    print(f"  {BOLD}╔══════════════════════════════════════════════════════════════╗{RESET}")
-    print(f"  {BOLD}║                    📜 SESSION HISTORY 📜                      ║{RESET}")
-    print(f"  {BOLD}╠══════════════════════════════════════════════════════════════╣{RESET}")
-    print()
+    lines = ['']
+    lines.append(f"  {BOLD}╔══════════════════════════════════════════════════════════════╗{RESET}")
+    lines.append(f"  {BOLD}║                    📜 SESSION HISTORY 📜                      ║{RESET}")
+    lines.append(f"  {BOLD}╠══════════════════════════════════════════════════════════════╣{RESET}")
+    lines.append('')
 
     # Show last 10 sessions (oldest to newest, so most recent is at bottom)
     for session_id, session_data in sorted_sessions[:10][::-1]:
@@ -1522,14 +1955,13 @@ def display_history(results, words):
             session_type = f"{CYAN}PRACTICE{RESET}"
         else:
             # Test sessions
-            results_list = session_data['results']
-            correct = sum(1 for r in results_list if r['correct'])
-            incorrect = sum(1 for r in results_list if not r['correct'])
+            correct = session_data['correct']
+            incorrect = session_data['incorrect']
             total = correct + incorrect
             if total > 0:
                 accuracy = correct / total * 100
                 acc_color = GREEN if accuracy >= 80 else YELLOW if accuracy >= 60 else RED
-                session_type = f"TEST    {acc_color}({accuracy:.0f}% acc){RESET}"
+                session_type = HISTORY_TEST_TPL % (acc_color, accuracy)
             else:
                 session_type = "TEST"
 
@@ -1547,16 +1979,23 @@ def display_history(results, words):
         else:
             groups_display = "Unknown"
 
-        print(f"  {BOLD}{date_str}{RESET}  │  {session_type}  │  {groups_display}")
-        print(f"      Duration: {duration_str}")
-        print()
+        lines.append(HISTORY_SESSION_TPL % (date_str, session_type, groups_display))
+        lines.append(HISTORY_DURATION_TPL % duration_str)
+        lines.append('')
 
     if len(sorted_sessions) > 10:
-        print(f"  {YELLOW}(Showing last 10 sessions of {len(sorted_sessions)} total){RESET}")
-        print()
+        lines.append(f"  {YELLOW}(Showing last 10 sessions of {len(sorted_sessions)} total){RESET}")
+        lines.append('')
+
+    lines.append('')
+    write_lines(lines)
+    prompt("  Press Enter to continue...")
 
-    print()
-    input("  Press Enter to continue...")
+
+# Score rows of the final score box
+FINAL_CORRECT_TPL = "  \033[1m║\033[0m   \033[92mCorrect:   %-28d\033[0m \033[1m║\033[0m"
+FINAL_INCORRECT_TPL = "  \033[1m║\033[0m   \033[91mIncorrect: %-28d\033[0m \033[1m║\033[0m"
+FINAL_ACCURACY_TPL = "  \033[1m║\033[0m   %sAccuracy:  %-27s\033[0m \033[1m║\033[0m"
 
 
 def show_final_score(correct_count, incorrect_count, complete=False):
@@ -1569,29 +2008,31 @@ def show_final_score(correct_count, incorrect_count, complete=False):
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
+    lines = ['']
     if complete:
-        print(f"\n  {BOLD}╔══════════════════════════════════════════╗{RESET}")
-        print(f"  {BOLD}║          🎉 QUIZ COMPLETE! 🎉             ║{RESET}")
-        print(f"  {BOLD}╠══════════════════════════════════════════╣{RESET}")
+        lines.append(f"  {BOLD}╔══════════════════════════════════════════╗{RESET}")
+        lines.append(f"  {BOLD}║          🎉 QUIZ COMPLETE! 🎉             ║{RESET}")
+        lines.append(f"  {BOLD}╠══════════════════════════════════════════╣{RESET}")
     else:
-        print(f"\n  {BOLD}╔══════════════════════════════════════════╗{RESET}")
-        print(f"  {BOLD}║            SESSION ENDED                  ║{RESET}")
-        print(f"  {BOLD}╠══════════════════════════════════════════╣{RESET}")
+        lines.append(f"  {BOLD}╔══════════════════════════════════════════╗{RESET}")
+        lines.append(f"  {BOLD}║            SESSION ENDED                  ║{RESET}")
+        lines.append(f"  {BOLD}╠══════════════════════════════════════════╣{RESET}")
 
-    print(f"  {BOLD}║{RESET}                                          {BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}   {GREEN}Correct:   {correct_count:<28}{RESET} {BOLD}║{RESET}")
-    print(f"  {BOLD}║{RESET}   {RED}Incorrect: {incorrect_count:<28}{RESET} {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}║{RESET}                                          {BOLD}║{RESET}")
+    lines.append(FINAL_CORRECT_TPL % correct_count)
+    lines.append(FINAL_INCORRECT_TPL % incorrect_count)
 
     total = correct_count + incorrect_count
     if total > 0:
         pct = correct_count / total * 100
         color = GREEN if pct >= 80 else YELLOW if pct >= 60 else RED
-        print(f"  {BOLD}║{RESET}   {color}Accuracy:  {pct:.1f}%{' ' * (27 - len(f'{pct:.1f}%'))}{RESET} {BOLD}║{RESET}")
+        lines.append(FINAL_ACCURACY_TPL % (color, '%.1f%%' % pct))
 
-    print(f"  {BOLD}║{RESET}                                          {BOLD}║{RESET}")
-    print(f"  {BOLD}╚══════════════════════════════════════════╝{RESET}")
-    print()
-    input("  Press Enter to continue...")
+    lines.append(f"  {BOLD}║{RESET}                                          {BOLD}║{RESET}")
+    lines.append(f"  {BOLD}╚══════════════════════════════════════════╝{RESET}")
+    lines.append('')
+    write_lines(lines)
+    prompt("  Press Enter to continue...")
 
 
 def main():
@@ -1607,6 +2048,9 @@ def main():
     words = load_words(csv_path)
     groups = get_groups(words)
 
+    # Never leave the shell in raw mode, even if a session crashes
+    atexit.register(restore_terminal)
+
     while True:
         results = load_results(results_path)
         has_results = len(results) > 0
@@ -1651,33 +2095,33 @@ def main():
                     invalid = [g for g in group_nums if g not in groups and g != 0]
                     if invalid:
                         print(f"  Invalid group(s): {invalid}")
-                        input("  Press Enter to continue...")
+                        prompt("  Press Enter to continue...")
                     elif 0 in group_nums:
                         run_practice(words, [0], results_path)
                     else:
                         run_practice(words, group_nums, results_path)
                 except ValueError:
                     print("  Invalid input. Use 'p' followed by group number(s) (e.g., 'p3' or 'p 1 2 3').")
-                    input("  Press Enter to continue...")
+                    prompt("  Press Enter to continue...")
         else:
             # Parse group numbers (single or multiple space-separated)
             try:
                 group_nums = [int(x) for x in choice.split()]
                 if not group_nums:
                     print("  Invalid input. Please enter a number or letter option.")
-                    input("  Press Enter to continue...")
+                    prompt("  Press Enter to continue...")
                     continue
                 invalid = [g for g in group_nums if g not in groups and g != 0]
                 if invalid:
                     print(f"  Invalid group(s): {invalid}")
-                    input("  Press Enter to continue...")
+                    prompt("  Press Enter to continue...")
                 elif 0 in group_nums:
                     run_quiz(words, [0], results_path)
                 else:
                     run_quiz(words, group_nums, results_path)
             except ValueError:
                 print("  Invalid input. Please enter a number or letter option.")
-                input("  Press Enter to continue...")
+                prompt("  Press Enter to continue...")
 
 
 if __name__ == '__main__':